@@ -1,32 +1,144 @@
 import asyncio
-from fastapi import FastAPI
-from fastapi.responses import StreamingResponse
-import httpx
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.responses import Response, StreamingResponse
 import os
 import uuid
 import json
 import base64
-from newsapi import NewsApiClient
+import importlib
+import logging
 from dotenv import load_dotenv
 from pathlib import Path
-from openai import OpenAI
-from runware import Runware, IImageInference
-from video_service import VideoService
 from fastapi.responses import FileResponse
+from outbound import OutboundClients
+from rate_limiter import ProviderScheduler, INTERACTIVE, BATCH
+from script_cache import ScriptCache
+from image_cache import ImageCache
+from scene_cache import SceneCache
+from event_bus import EventBus, format_event_id, parse_event_id
+
+logger = logging.getLogger(__name__)
+
+# Heavy SDKs (openai, runware) and the moviepy-based video stack are imported
+# inside the functions that need them, so workers that never render start fast and small.
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Initialize FastAPI application
-app = FastAPI()
+# NewsAPI top-headlines endpoint, called directly through the shared HTTP pool
+NEWS_API_URL = "https://newsapi.org/v2/top-headlines"
+
+# Shared async clients (pooled httpx + OpenAI) for every outbound call, opened by the app lifespan.
+# OpenAI retries are left to the scheduler so it sees every 429.
+outbound = OutboundClients(openai_retries=0)
+
+# Per-provider and per-model request budgets. Rates apply at both levels; concurrency is adapted
+# per (provider, model), so a provider entry's concurrency only serves as the default for its models
+PROVIDER_LIMITS = {
+    "openai": {"rate": 8.0, "burst": 16},
+    ("openai", "gpt-4"): {"rate": 2.0, "burst": 4, "concurrency": 2, "max_concurrency": 8},
+    ("openai", "tts-1"): {"rate": 4.0, "burst": 10, "concurrency": 4, "max_concurrency": 16},
+    "runware": {"rate": 4.0, "burst": 10, "concurrency": 4, "max_concurrency": 16},
+    "newsapi": {"rate": 1.0, "burst": 5, "concurrency": 2, "max_concurrency": 4},
+}
+
+# Process-wide scheduler shared by every pipeline running in this worker
+scheduler = ProviderScheduler(PROVIDER_LIMITS)
+
+# Model used for script generation and the version of its prompt template; bump the
+# version whenever the prompt in generate_news_script changes so cached scripts are not reused
+SCRIPT_MODEL = "gpt-4"
+SCRIPT_PROMPT_VERSION = "1"
+
+# Image generation settings; IMAGE_SEED pins Runware's seed (unset means the provider picks one)
+IMAGE_MODEL = "runware:100@1"
+IMAGE_WIDTH = 1152
+IMAGE_HEIGHT = 2048
+IMAGE_SEED = int(os.environ["IMAGE_SEED"]) if os.getenv("IMAGE_SEED") else None
+
+# Downloaded images keyed by (model, size, normalized prompt, seed)
+image_cache = ImageCache(max_bytes=int(os.getenv("IMAGE_CACHE_MAX_MB", "2048")) * 1024 * 1024)
+
+# Validated scripts keyed by (model, prompt version, article content)
+script_cache = ScriptCache(
+    ttl=float(os.getenv("SCRIPT_CACHE_TTL", str(7 * 24 * 3600))),
+    max_bytes=int(os.getenv("SCRIPT_CACHE_MAX_MB", "50")) * 1024 * 1024
+)
+
+# Warm-up on startup: "off" (default, fully lazy), "background" or "blocking" (render workers)
+WARMUP_MODE = os.getenv("WARMUP", "off").lower()
+
+# Number of processes used to render scenes in parallel (1 renders in-process)
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", "1"))
+
+# x264 settings for full renders; previews always use a fast preset at reduced size and frame rate
+RENDER_PRESET = os.getenv("RENDER_PRESET", "medium")
+RENDER_CRF = int(os.environ["RENDER_CRF"]) if os.getenv("RENDER_CRF") else None
+RENDER_THREADS = int(os.environ["RENDER_THREADS"]) if os.getenv("RENDER_THREADS") else None
+
+# Rendered scene segments keyed by content and render settings, so re-renders only encode changed scenes
+SCENE_CACHE = None
+if os.getenv("SCENE_CACHE", "on").lower() != "off":
+    SCENE_CACHE = SceneCache(max_bytes=int(os.getenv("SCENE_CACHE_MAX_MB", "5120")) * 1024 * 1024)
+
+# Pipeline events buffered per request, so clients can disconnect and replay with Last-Event-ID
+event_bus = EventBus(
+    buffer_size=int(os.getenv("EVENT_BUFFER_SIZE", "1000")),
+    retention=float(os.getenv("EVENT_RETENTION_SECONDS", "3600"))
+)
+
+# Seconds of silence after which SSE subscribers get a heartbeat event
+SSE_HEARTBEAT_SECONDS = 15
 
-# Initialize global OpenAI client with API key from environment
-openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Running pipeline tasks, referenced so they are not garbage-collected mid-run
+pipeline_runs = set()
 
 # Global variables to store the latest news article and AI-generated script response
 latest_article = None
 latest_ai_response = None
 
+def warm_up():
+    """
+    Import every heavy dependency and prepare the render stack ahead of the first request.
+    Render workers call this (or set WARMUP=blocking) so the first video pays no import cost.
+    """
+    import openai  # noqa: F401
+    import runware  # noqa: F401
+    from video_generator import VideoGenerator
+    # Loading a generator also fetches the subtitle font into the temp directory
+    VideoGenerator(width=1080, height=1920)
+
+def log_warm_up_failure(future):
+    """Report a failed background warm-up, which would otherwise be dropped with its future."""
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Background warm-up failed", exc_info=future.exception())
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Open the shared outbound clients and run the optional warm-up configured through WARMUP.
+    On shutdown, running pipelines are cancelled before the clients are closed.
+    """
+    await outbound.start()
+    if WARMUP_MODE == "blocking":
+        await asyncio.to_thread(warm_up)
+    elif WARMUP_MODE == "background":
+        # Requests arriving meanwhile simply import what they need themselves
+        warm_up_future = asyncio.get_running_loop().run_in_executor(None, warm_up)
+        warm_up_future.add_done_callback(log_warm_up_failure)
+    try:
+        yield
+    finally:
+        # Stop running pipelines before closing the clients they are still using
+        for task in list(pipeline_runs):
+            task.cancel()
+        await asyncio.gather(*pipeline_runs, return_exceptions=True)
+        await outbound.close()
+
+# Initialize FastAPI application
+app = FastAPI(lifespan=lifespan)
+
 def create_task_response(requestId: str, task: str, status: str, message: str = "") -> str:
     """
     Generate a standardized JSON response for task status updates.
@@ -43,7 +155,7 @@ def create_task_response(requestId: str, task: str, status: str, message: str =
     response = {"RequestId": requestId, "Task": task, "Status": status, "Message": message}
     return json.dumps(response)
 
-async def fetch_news_article(country: str, category: str, query: str, request_id: str):
+async def fetch_news_article(country: str, category: str, query: str, request_id: str, priority: int = INTERACTIVE):
     """
     Fetch a news article from NewsAPI based on country, category, and optional query.
     
@@ -52,6 +164,7 @@ async def fetch_news_article(country: str, category: str, query: str, request_id
         category (str): News category (e.g., "business").
         query (str): Optional search term for news.
         request_id (str): Unique identifier for the request.
+        priority (int): Scheduler lane for outbound calls (INTERACTIVE or BATCH).
     
     Yields:
         str: JSON response indicating success or error.
@@ -62,21 +175,23 @@ async def fetch_news_article(country: str, category: str, query: str, request_id
         yield create_task_response(request_id, "1", "Error", "NEWS_API_KEY not set in environment.")
         return
     
-    # Initialize NewsAPI client
-    newsapi = NewsApiClient(api_key=api_key)
-    
     # Build query parameters
-    kwargs = {
+    params = {
         "country": country,
         "category": category,
-        "page_size": 5
+        "pageSize": 5
     }
     if query:
-        kwargs["q"] = query
+        params["q"] = query
     
     try:
-        # Fetch top headlines in a separate thread to avoid blocking
-        news_json = await asyncio.to_thread(newsapi.get_top_headlines, **kwargs)
+        # Fetch top headlines over the shared connection pool
+        response = await scheduler.call(
+            "newsapi", "top-headlines",
+            lambda: outbound.get(NEWS_API_URL, params=params, headers={"X-Api-Key": api_key}, retries=0),
+            priority
+        )
+        news_json = response.json()
     except Exception as e:
         news_json = {"error": str(e)}
     
@@ -97,12 +212,13 @@ async def fetch_news_article(country: str, category: str, query: str, request_id
     else:
         yield create_task_response(request_id, "1", "Error", "No valid news article found with all required fields.")
 
-async def generate_news_script(request_id: str):
+async def generate_news_script(request_id: str, priority: int = INTERACTIVE):
     """
     Generate a 2-minute YouTube Shorts script from the latest news article using OpenAI GPT-4.
     
     Args:
         request_id (str): Unique identifier for the request.
+        priority (int): Scheduler lane for outbound calls (INTERACTIVE or BATCH).
     
     Yields:
         str: JSON response indicating success or error.
@@ -140,13 +256,16 @@ Return the final result in the following JSON structure:
 }}'''
     
     try:
-        # Call OpenAI API in a separate thread for non-blocking execution
-        response = await asyncio.to_thread(
+        # Call OpenAI API with the shared async client
+        openai_client = await outbound.openai_client()
+        response = await scheduler.call(
+            "openai", SCRIPT_MODEL,
             lambda: openai_client.chat.completions.create(
-                model="gpt-4",
+                model=SCRIPT_MODEL,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.7
-            )
+            ),
+            priority
         )
         ai_output = response.choices[0].message.content
         try:
@@ -159,12 +278,13 @@ Return the final result in the following JSON structure:
     except Exception as e:
         yield create_task_response(request_id, "2", "Error", str(e))
 
-async def serialize_script_response(request_id: str):
+async def serialize_script_response(request_id: str, cache_key: str = None):
     """
     Serialize and validate the AI-generated script response, adding scene IDs and request ID.
     
     Args:
         request_id (str): Unique identifier for the request.
+        cache_key (str): Script cache key; a script that passes validation is stored under it.
     
     Yields:
         str: JSON response indicating success, error, or serialized data.
@@ -212,6 +332,9 @@ async def serialize_script_response(request_id: str):
         if error_messages:
             yield create_task_response(request_id, "2a", "Error", "; ".join(error_messages))
         else:
+            if cache_key:
+                # Cache without per-run identifiers; hits get fresh ones
+                script_cache.put(cache_key, json.loads(latest_ai_response))
             yield create_task_response(request_id, "2a", "Success")
         
         # Serialize validated JSON and yield
@@ -220,7 +343,30 @@ async def serialize_script_response(request_id: str):
     except Exception as e:
         yield create_task_response(request_id, "2a", "Error", str(e))
 
-async def generate_audio_file(request_id: str, text: str, scene_number: str) -> str:
+async def serve_cached_script(request_id: str, script: dict):
+    """
+    Use a cached script in place of tasks 2 and 2a, assigning fresh scene IDs and request ID.
+    
+    Args:
+        request_id (str): Unique identifier for the request.
+        script (dict): Validated script data from the script cache.
+    
+    Yields:
+        str: JSON responses mirroring tasks 2 and 2a.
+    """
+    global latest_ai_response
+    ai_data = dict(script)
+    ai_data["request_id"] = request_id
+    for key in ai_data:
+        if key.isdigit() and isinstance(ai_data[key], dict):
+            ai_data[key] = dict(ai_data[key], scene_id=str(uuid.uuid4()))
+    latest_ai_response = json.dumps(ai_data)
+    
+    yield create_task_response(request_id, "2", "Success", "Script loaded from cache.")
+    yield create_task_response(request_id, "2a", "Success")
+    yield create_task_response(request_id, "2a", "Success", json.dumps(ai_data, indent=2))
+
+async def generate_audio_file(request_id: str, text: str, scene_number: str, priority: int = INTERACTIVE) -> str:
     """
     Generate an audio file from text using OpenAI's TTS API and save it to disk.
     
@@ -228,6 +374,7 @@ async def generate_audio_file(request_id: str, text: str, scene_number: str) ->
         request_id (str): Unique identifier for the request.
         text (str): Text to convert to audio.
         scene_number (str): Scene number for naming the audio file.
+        priority (int): Scheduler lane for outbound calls (INTERACTIVE or BATCH).
     
     Returns:
         str: Path to the generated audio file.
@@ -239,24 +386,29 @@ async def generate_audio_file(request_id: str, text: str, scene_number: str) ->
     os.makedirs(f"data/{request_id}", exist_ok=True)
     file_path = os.path.join(f"data/{request_id}", f"audio-{scene_number}.mp3")
     
-    try:
-        # Generate audio using OpenAI TTS
-        response = openai_client.audio.speech.create(
+    async def synthesize():
+        # Generate audio using OpenAI TTS, streaming the body straight to disk
+        openai_client = await outbound.openai_client()
+        async with openai_client.audio.speech.with_streaming_response.create(
             model="tts-1",
             voice="nova",
             input=text,
-        )
-        response.stream_to_file(file_path)
+        ) as response:
+            await response.stream_to_file(file_path)
+    
+    try:
+        await scheduler.call("openai", "tts-1", synthesize, priority)
     except Exception as e:
         raise e
     return file_path
 
-async def convert_scripts_to_audio(request_id: str):
+async def convert_scripts_to_audio(request_id: str, priority: int = INTERACTIVE):
     """
     Convert each scene's script to an audio file using OpenAI TTS.
     
     Args:
         request_id (str): Unique identifier for the request.
+        priority (int): Scheduler lane for outbound calls (INTERACTIVE or BATCH).
     
     Yields:
         str: JSON response for each scene's audio generation status.
@@ -280,7 +432,7 @@ async def convert_scripts_to_audio(request_id: str):
             script_text = scene["script"]
             try:
                 # Generate audio file for the scene
-                file_path = await generate_audio_file(request_id, script_text, scene_number)
+                file_path = await generate_audio_file(request_id, script_text, scene_number, priority)
                 ai_data[scene_number]["audioPath"] = file_path
                 messages.append(create_task_response(request_id, "3", "Success", f"Audio file generated for scene {scene_number}: {file_path}"))
             except Exception as gen_err:
@@ -294,12 +446,14 @@ async def convert_scripts_to_audio(request_id: str):
     for m in messages:
         yield m
 
-async def generate_scene_images(request_id: str):
+async def generate_scene_images(request_id: str, priority: int = INTERACTIVE):
     """
-    Generate images for each scene using Runware's image inference API.
+    Generate images for each scene using Runware's image inference API, serving repeated
+    prompts from the local image cache and downloading new images into it.
     
     Args:
         request_id (str): Unique identifier for the request.
+        priority (int): Scheduler lane for outbound calls (INTERACTIVE or BATCH).
     
     Yields:
         str: JSON response for each scene's image generation status.
@@ -316,33 +470,55 @@ async def generate_scene_images(request_id: str):
         yield create_task_response(request_id, "4", "Error", f"Error parsing AI response: {str(e)}")
         return
     
-    try:
-        # Initialize and connect to Runware client
-        runware_client = Runware(api_key=os.getenv("RUNWARE_API_KEY"))
-        await runware_client.connect()
-    except Exception as e:
-        yield create_task_response(request_id, "4", "Error", f"Error connecting to Runware: {str(e)}")
-        return
-
+    os.makedirs(f"data/{request_id}", exist_ok=True)
+    runware_client = None
+    
     messages = []
     for scene_number in map(str, range(1, 11)):
         scene = ai_data.get(scene_number)
         if scene and "imagePrompt" in scene:
             image_prompt = scene["imagePrompt"]
+            image_path = os.path.join(f"data/{request_id}", f"image-{scene_number}.jpg")
+            cache_key = ImageCache.make_key(IMAGE_MODEL, IMAGE_WIDTH, IMAGE_HEIGHT, image_prompt, IMAGE_SEED)
+            if image_cache.fetch(cache_key, image_path):
+                ai_data[scene_number]["imagePath"] = image_path
+                messages.append(create_task_response(request_id, "4", "Success", f"Image served from cache for scene {scene_number}: {image_path}"))
+                continue
+            
+            if runware_client is None:
+                try:
+                    # Initialize and connect to Runware client on the first cache miss; the SDK is
+                    # imported in a worker thread so its first import doesn't stall other streams
+                    runware = await asyncio.to_thread(importlib.import_module, "runware")
+                    Runware, IImageInference = runware.Runware, runware.IImageInference
+                    runware_client = Runware(api_key=os.getenv("RUNWARE_API_KEY"))
+                    await runware_client.connect()
+                except Exception as e:
+                    runware_client = None
+                    messages.append(create_task_response(request_id, "4", "Error", f"Error connecting to Runware: {str(e)}"))
+                    break
+            
             try:
-                # Create image inference request
-                request_image = IImageInference(
-                    positivePrompt=image_prompt,
-                    taskUUID=str(uuid.uuid4()),
-                    model="runware:100@1",
-                    numberResults=1,
-                    height=2048,
-                    width=1152
+                # Create image inference request; a fresh task UUID per attempt keeps retries distinct
+                images = await scheduler.call(
+                    "runware", IMAGE_MODEL,
+                    lambda: runware_client.imageInference(requestImage=IImageInference(
+                        positivePrompt=image_prompt,
+                        taskUUID=str(uuid.uuid4()),
+                        model=IMAGE_MODEL,
+                        numberResults=1,
+                        height=IMAGE_HEIGHT,
+                        width=IMAGE_WIDTH,
+                        **({"seed": IMAGE_SEED} if IMAGE_SEED is not None else {})
+                    )),
+                    priority
                 )
-                images = await runware_client.imageInference(requestImage=request_image)
                 if images and len(images) > 0:
                     image_url = images[0].imageURL
                     ai_data[scene_number]["imageUrl"] = image_url
+                    # Download once into the cache; stitching then reads the local file
+                    response = await outbound.get(image_url)
+                    ai_data[scene_number]["imagePath"] = image_cache.put(cache_key, response.content, image_path)
                     messages.append(create_task_response(request_id, "4", "Success", f"Image generated for scene {scene_number}: {image_url}"))
                 else:
                     messages.append(create_task_response(request_id, "4", "Error", f"No image generated for scene {scene_number}."))
@@ -357,29 +533,92 @@ async def generate_scene_images(request_id: str):
     for m in messages:
         yield m
 
-async def stitch_video_from_scenes(request_id: str):
+async def download_scene_image(request_id: str, scene_number: str, image_url: str) -> str:
+    """
+    Download a scene image through the shared HTTP pool and save it next to the scene audio.
+    
+    Args:
+        request_id (str): Unique identifier for the request.
+        scene_number (str): Scene number for naming the image file.
+        image_url (str): URL of the generated image.
+    
+    Returns:
+        str: Path to the downloaded image file.
+    """
+    response = await outbound.get(image_url)
+    file_path = os.path.join(f"data/{request_id}", f"image-{scene_number}.jpg")
+    with open(file_path, "wb") as image_file:
+        image_file.write(response.content)
+    return file_path
+
+def create_video_service(width: int, height: int, preview: bool = False):
+    """
+    Build a VideoService with the configured workers, scene cache and encoder settings.
+    
+    Args:
+        width (int): Full-resolution video width.
+        height (int): Full-resolution video height.
+        preview (bool): Render a fast low-resolution draft instead.
+    
+    Returns:
+        VideoService: Configured video service.
+    """
+    from video_service import VideoService
+    return VideoService(width=width, height=height, render_workers=RENDER_WORKERS, scene_cache=SCENE_CACHE,
+                        preview=preview, preset=RENDER_PRESET, crf=RENDER_CRF, threads=RENDER_THREADS)
+
+async def stitch_video_from_scenes(request_id: str, preview: bool = False, renditions: bool = False):
     """
     Stitch scenes into a final video using VideoService, combining audio, images, and subtitles.
     
     Args:
         request_id (str): Unique identifier for the request.
+        preview (bool): Render a fast low-resolution draft instead of the full video.
+        renditions (bool): Also encode 720x1280 and a GIF teaser from the same frame pass.
     
     Yields:
         str: JSON response indicating video generation status.
     """
-    # Initialize VideoService with 1080x1920 resolution
-    service = VideoService(width=1080, height=1920)
+    # Initialize VideoService with 1080x1920 resolution; building it imports the render stack and
+    # may download the subtitle font, so it runs in a worker thread rather than on the event loop
+    service = await asyncio.to_thread(create_video_service, 1080, 1920, preview)
+    output_video = f"data/{request_id}/final_preview.mp4" if preview else f"data/{request_id}/final_video.mp4"
+    
+    # Download any images not already on disk concurrently, so VideoService only reads local files
+    ai_data = json.loads(latest_ai_response)
+    scene_numbers = [
+        key for key in ai_data
+        if key.isdigit() and ai_data[key].get("imageUrl")
+        and not os.path.exists(ai_data[key].get("imagePath", ""))
+    ]
+    try:
+        image_paths = await asyncio.gather(*(
+            download_scene_image(request_id, key, ai_data[key]["imageUrl"]) for key in scene_numbers
+        ))
+    except Exception as e:
+        yield create_task_response(request_id, "5", "Error", f"Error downloading scene images: {str(e)}")
+        return
+    for key, image_path in zip(scene_numbers, image_paths):
+        ai_data[key]["imagePath"] = image_path
     
     # Save AI response as JSON payload
     filename = f"data/{request_id}/payload.json"
     with open(filename, 'w') as file:
-        json.dump(json.loads(latest_ai_response), file, indent=2)
-    
-    # Generate video
-    service.generate(filename, f"data/{request_id}/final_video.mp4")
-    yield create_task_response(request_id, "5", "Success", f"Video generated: data/{request_id}/final_video.mp4")
+        json.dump(ai_data, file, indent=2)
+    
+    # Generate video off the event loop; rendering is CPU-bound
+    if renditions and not preview:
+        from multi_output import default_renditions
+        outputs = default_renditions(f"data/{request_id}")
+        await asyncio.to_thread(service.generate_renditions, filename, outputs)
+        yield create_task_response(request_id, "5", "Success", f"Videos generated: {', '.join(spec.path for spec in outputs)}")
+    else:
+        await asyncio.to_thread(service.generate, filename, output_video)
+        yield create_task_response(request_id, "5", "Success", f"Video generated: {output_video}")
 
-async def pipeline_tasks(country: str, category: str, query: str):
+async def pipeline_tasks(country: str, category: str, query: str, priority: int = INTERACTIVE,
+                         use_script_cache: bool = True, preview: bool = False, renditions: bool = False,
+                         request_id: str = None):
     """
     Orchestrate the video generation pipeline, executing tasks sequentially.
     
@@ -387,51 +626,118 @@ async def pipeline_tasks(country: str, category: str, query: str):
         country (str): Country code for news.
         category (str): News category.
         query (str): Optional search term for news.
+        priority (int): Scheduler lane for outbound calls (INTERACTIVE or BATCH).
+        use_script_cache (bool): Reuse a cached script for an already-scripted article.
+        preview (bool): Render a fast low-resolution draft instead of the full video.
+        renditions (bool): Also encode 720x1280 and a GIF teaser from the same frame pass.
+        request_id (str): Request ID to use; a new one is generated when not given.
     
     Yields:
         str: JSON response for each task's status.
     """
     # Generate unique request ID
-    request_id = str(uuid.uuid4())
+    request_id = request_id or str(uuid.uuid4())
     yield create_task_response(request_id, "0", "Success", f"Request ID: {request_id}")
     
     # Execute pipeline tasks
-    async for message in fetch_news_article(country, category, query, request_id):
-        yield message
-    async for message in generate_news_script(request_id):
-        yield message
-    async for message in serialize_script_response(request_id):
+    async for message in fetch_news_article(country, category, query, request_id, priority):
         yield message
-    async for message in convert_scripts_to_audio(request_id):
+    
+    # Skip script generation entirely when this article has been scripted before
+    cache_key = None
+    cached_script = None
+    if latest_article is not None:
+        cache_key = ScriptCache.make_key(SCRIPT_MODEL, SCRIPT_PROMPT_VERSION, latest_article)
+        if use_script_cache:
+            cached_script = script_cache.get(cache_key)
+    if cached_script is not None:
+        async for message in serve_cached_script(request_id, cached_script):
+            yield message
+    else:
+        async for message in generate_news_script(request_id, priority):
+            yield message
+        async for message in serialize_script_response(request_id, cache_key):
+            yield message
+    async for message in convert_scripts_to_audio(request_id, priority):
         yield message
-    async for message in generate_scene_images(request_id):
+    async for message in generate_scene_images(request_id, priority):
         yield message
-    async for message in stitch_video_from_scenes(request_id):
+    async for message in stitch_video_from_scenes(request_id, preview, renditions):
         yield message
     yield create_task_response(request_id, "Completed", "Success", f"Request ID: {request_id}")
 
-@app.get("/stream")
-async def stream_endpoint(country: str = "us", category: str = "business", query: str = ""):
+def is_completed_message(message: str) -> bool:
     """
-    Stream the video generation pipeline as Server-Sent Events (SSE).
+    Check whether a task status message marks the end of the pipeline.
     
     Args:
-        country (str): Country code for news (default: "us").
-        category (str): News category (default: "business").
-        query (str): Optional search term for news.
+        message (str): JSON task status message.
+    
+    Returns:
+        bool: True for the "Completed" task.
+    """
+    try:
+        return json.loads(message).get("Task") == "Completed"
+    except (ValueError, AttributeError):
+        return False
+
+async def run_pipeline(channel, **options):
+    """
+    Run a pipeline to completion, publishing every status message to its event channel.
+    The pipeline lives independently of any SSE connection reading the channel.
+    
+    Args:
+        channel (RequestChannel): Event channel of the request.
+        **options: Keyword arguments for pipeline_tasks.
+    """
+    try:
+        async for message in pipeline_tasks(request_id=channel.request_id, **options):
+            await channel.publish(message)
+    except Exception as e:
+        await channel.publish(create_task_response(channel.request_id, "Failed", "Error", str(e)))
+    finally:
+        await channel.close()
+
+def start_pipeline(**options):
+    """
+    Start a pipeline in the background under a new request ID.
+    
+    Args:
+        **options: Keyword arguments for pipeline_tasks.
+    
+    Returns:
+        RequestChannel: Event channel the pipeline publishes to.
+    """
+    channel = event_bus.create(str(uuid.uuid4()))
+    task = asyncio.create_task(run_pipeline(channel, **options))
+    pipeline_runs.add(task)
+    task.add_done_callback(pipeline_runs.discard)
+    return channel
+
+def sse_response(channel, after: int = 0) -> StreamingResponse:
+    """
+    Stream a request channel as Server-Sent Events, replaying events after sequence `after`.
+    
+    Args:
+        channel (RequestChannel): Event channel of the request.
+        after (int): Last sequence number the client has seen.
     
     Returns:
         StreamingResponse: SSE stream of task status updates.
     """
     async def event_generator():
-        # Yield task status messages as SSE events
-        async for message in pipeline_tasks(country, category, query):
-            yield f"data: {message}\n\n"
+        # Tell EventSource clients to reconnect quickly after a drop
+        yield "retry: 3000\n\n"
+        async for event in channel.subscribe(after, SSE_HEARTBEAT_SECONDS):
+            if event is None:
+                yield "event: heartbeat\ndata: {}\n\n"
+                continue
+            seq, message = event
+            yield f"id: {format_event_id(channel.request_id, seq)}\ndata: {message}\n\n"
             # Terminate stream after "Completed" message
-            if '"Task":"Completed"' in message:
-                yield "data: {}\n\n"  # Signal end of stream
+            if is_completed_message(message):
                 break
-        return
+        yield "data: {}\n\n"  # Signal end of stream
 
     return StreamingResponse(
         event_generator(),
@@ -443,20 +749,93 @@ async def stream_endpoint(country: str = "us", category: str = "business", query
         }
     )
 
+@app.get("/stream")
+async def stream_endpoint(country: str = "us", category: str = "business", query: str = "", batch: bool = False,
+                          fresh_script: bool = False, preview: bool = False, renditions: bool = False,
+                          last_event_id: str = Header(None)):
+    """
+    Start the video generation pipeline and stream its progress as Server-Sent Events (SSE).
+    A reconnect carrying a Last-Event-ID header resumes the original pipeline and never starts a new one;
+    if that run is unknown, expired or already fully delivered, 204 tells EventSource to stop reconnecting.
+    
+    Args:
+        country (str): Country code for news (default: "us").
+        category (str): News category (default: "business").
+        query (str): Optional search term for news.
+        batch (bool): Run in the batch lane, yielding provider capacity to interactive requests.
+        fresh_script (bool): Ignore the script cache and generate a new script.
+        preview (bool): Render a fast low-resolution draft instead of the full video.
+        renditions (bool): Also encode 720x1280 and a GIF teaser from the same frame pass.
+        last_event_id (str): Last-Event-ID header sent by reconnecting EventSource clients.
+    
+    Returns:
+        StreamingResponse: SSE stream of task status updates, or an empty 204 response.
+    """
+    if last_event_id:
+        request_id, seq = parse_event_id(last_event_id)
+        channel = event_bus.get(request_id) if request_id else None
+        if channel is None or channel.drained(seq):
+            return Response(status_code=204)
+        return sse_response(channel, seq)
+
+    channel = start_pipeline(country=country, category=category, query=query,
+                             priority=BATCH if batch else INTERACTIVE, use_script_cache=not fresh_script,
+                             preview=preview, renditions=renditions)
+    return sse_response(channel)
+
+@app.get("/stream/{request_id}")
+async def subscribe_endpoint(request_id: str, last_event_id: str = Header(None), after: int = None):
+    """
+    Subscribe to an already running (or recently finished) pipeline's events.
+    
+    Args:
+        request_id (str): Unique identifier of the pipeline request.
+        last_event_id (str): Last-Event-ID header; events after it are replayed.
+        after (int): Sequence number to replay after, for clients that cannot set headers.
+    
+    Returns:
+        StreamingResponse: SSE stream of task status updates, or an empty 204 response once
+        a finished run has been fully delivered.
+    """
+    channel = event_bus.get(request_id)
+    if channel is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired request: {request_id}")
+    if after is None:
+        header_request_id, after = parse_event_id(last_event_id)
+        if header_request_id not in (None, request_id):
+            after = 0
+    if after and channel.drained(after):
+        return Response(status_code=204)
+    return sse_response(channel, after)
+
+@app.get("/metrics/providers")
+async def provider_metrics():
+    """
+    Report the provider scheduler's state: queue wait, in-flight calls, adaptive limits and 429 counts.
+    
+    Returns:
+        dict: Metrics keyed by "provider/model".
+    """
+    return scheduler.metrics()
+
 @app.get("/test-video")
-def test_video():
+def test_video(preview: bool = False):
     """
     Test endpoint to generate a video from a sample JSON payload.
     
+    Args:
+        preview (bool): Render a fast low-resolution draft instead of the full video.
+    
     Returns:
         FileResponse: Generated MP4 video file.
     """
     # Initialize VideoService with 1152x2048 resolution
-    service = VideoService(width=1152, height=2048)
+    service = create_video_service(1152, 2048, preview)
     input_json = "data/f851c750-b4a6-45fa-b23d-5c268e738e95/payload.json"
     os.makedirs("data", exist_ok=True)
-    output_video = "data/test_video.mp4"
+    output_name = "test_video_preview.mp4" if preview else "test_video.mp4"
+    output_video = os.path.join("data", output_name)
     
     # Generate and return video
     service.generate(input_json, output_video)
-    return FileResponse(output_video, media_type="video/mp4", filename="test_video.mp4")
\ No newline at end of file
+    return FileResponse(output_video, media_type="video/mp4", filename=output_name)
\ No newline at end of file
@@ -0,0 +1,71 @@
+import logging
+import numpy as np
+from typing import List, Tuple
+from ffmpeg_tools import decode_audio, encode_audio
+from render_plan import RenderPlan
+
+logger = logging.getLogger(__name__)
+
+
+class AudioTrack:
+    """A pre-mixed narration track and the exact placement of every scene within it."""
+
+    def __init__(self, path: str, offsets: List[Tuple[float, float]], duration: float):
+        self.path = path
+        # (start, duration) in seconds for each scene, in scene order
+        self.offsets = offsets
+        self.duration = duration
+
+
+class AudioMixer:
+    def __init__(self, fps: int = 44100, channels: int = 2, crossfade: float = 0.0,
+                 normalize: bool = False):
+        self.fps = fps
+        self.channels = channels
+        self.crossfade = crossfade
+        self.normalize = normalize
+
+    def mix_plan(self, plan: RenderPlan, output_path: str) -> AudioTrack:
+        """
+        Mix narration at the offsets of a precomputed render plan, so the audio
+        lines up exactly with the frame counts the video was planned against.
+        """
+        # More than one video frame of mismatch means the probed duration was wrong, not just rounded
+        tolerance = self.fps / plan.fps
+        decoded = []
+        for scene in plan.scenes:
+            samples = decode_audio(scene.scene_data["audioPath"], self.fps, self.channels)
+            # Header-probed durations can differ from the decoded length by a few ms; the plan wins
+            length = round(scene.audio_duration * self.fps)
+            if abs(len(samples) - length) > tolerance:
+                logger.warning(
+                    f"Scene {scene.index} audio decodes to {len(samples) / self.fps:.3f}s but was planned "
+                    f"as {scene.audio_duration:.3f}s; narration will be truncated or padded"
+                )
+            if len(samples) >= length:
+                samples = samples[:length]
+            else:
+                samples = np.pad(samples, ((0, length - len(samples)), (0, 0)))
+            decoded.append(samples)
+
+        starts = [round(scene.start * self.fps) for scene in plan.scenes]
+        fade = min(round(plan.crossfade * self.fps), min(len(samples) for samples in decoded) // 2)
+        return self._render(decoded, starts, fade, plan.audio_offsets, output_path)
+
+    def _render(self, decoded: List[np.ndarray], starts: List[int], fade: int,
+                offsets: List[Tuple[float, float]], output_path: str) -> AudioTrack:
+        total = max(start + len(samples) for start, samples in zip(starts, decoded))
+        buffer = np.zeros((total, self.channels), dtype=np.float32)
+        if fade:
+            ramp = np.linspace(0.0, 1.0, fade, dtype=np.float32)[:, None]
+        for i, (start, samples) in enumerate(zip(starts, decoded)):
+            if fade:
+                samples = samples.copy()
+                if i > 0:
+                    samples[:fade] *= ramp
+                if i < len(decoded) - 1:
+                    samples[-fade:] *= ramp[::-1]
+            buffer[start:start + len(samples)] += samples
+
+        encode_audio(buffer, output_path, fps=self.fps, normalize=self.normalize)
+        return AudioTrack(output_path, offsets, total / self.fps)
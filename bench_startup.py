@@ -0,0 +1,58 @@
+"""
+Measure cold-start cost of the FastAPI app: time to import `app` and the
+resulting peak RSS, optionally followed by the render warm-up.
+
+Each run happens in a fresh interpreter so nothing is cached between runs.
+
+Usage:
+    python bench_startup.py            # import only, 5 runs
+    python bench_startup.py --warm     # import + warm_up()
+    python bench_startup.py --runs 10
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+PROBE = """
+import json, resource, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+if {warm}:
+    app.warm_up()
+done = time.perf_counter()
+print(json.dumps({{
+    "import_s": imported - start,
+    "warm_up_s": done - imported,
+    "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+}}))
+"""
+
+
+def run_once(warm: bool) -> dict:
+    proc = subprocess.run([sys.executable, "-c", PROBE.format(warm=warm)],
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+    return json.loads(proc.stdout.decode().strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark app.py import time and memory.")
+    parser.add_argument("--runs", type=int, default=5, help="Number of fresh interpreters to measure")
+    parser.add_argument("--warm", action="store_true", help="Also run warm_up() after importing")
+    args = parser.parse_args()
+
+    results = [run_once(args.warm) for _ in range(args.runs)]
+    summary = {
+        key: {
+            "median": statistics.median(r[key] for r in results),
+            "max": max(r[key] for r in results),
+        }
+        for key in ("import_s", "warm_up_s", "peak_rss_mb")
+    }
+    print(json.dumps({"runs": args.runs, "warm": args.warm, "results": summary}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def atomic_write(path: str, data: bytes):
+    """Write bytes to `path` via a temp file and rename, so readers never see partial entries."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def link_or_copy(src: str, dest: str):
+    """Hard-link `src` to `dest` when on the same filesystem, otherwise copy it."""
+    if os.path.exists(dest):
+        os.remove(dest)
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copyfile(src, dest)
+
+
+def remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except OSError as e:
+        logger.warning(f"Failed to evict cache entry {path}: {e}")
+
+
+def evict_lru(directory: str, suffix: str, max_bytes: int, ttl: float = None):
+    """
+    Trim a cache directory: drop entries unused for longer than `ttl` seconds, then
+    least recently used ones until the remaining entries fit in `max_bytes`.
+    Entries are files ending in `suffix`; their mtime is treated as last use.
+    """
+    try:
+        names = [name for name in os.listdir(directory) if name.endswith(suffix)]
+    except OSError:
+        return
+    now = time.time()
+    entries = []
+    for name in names:
+        path = os.path.join(directory, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = 0
+    for mtime, size, path in sorted(entries, reverse=True):
+        if (ttl is not None and now - mtime > ttl) or total + size > max_bytes:
+            remove_quietly(path)
+        else:
+            total += size
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file's contents, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,106 @@
+import asyncio
+import time
+from collections import deque
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+
+def format_event_id(request_id: str, seq: int) -> str:
+    """SSE event ID carrying the request, so a bare EventSource reconnect can find its pipeline."""
+    return f"{request_id}:{seq}"
+
+
+def parse_event_id(value: str) -> Tuple[Optional[str], int]:
+    """Split a Last-Event-ID value into (request_id, seq); a bare number has no request."""
+    if not value:
+        return None, 0
+    request_id, _, seq = value.rpartition(":")
+    try:
+        return request_id or None, int(seq)
+    except ValueError:
+        return None, 0
+
+
+class RequestChannel:
+    """
+    Ring buffer of one pipeline's events with sequence IDs. Any number of subscribers
+    can read it, each from its own cursor, so a reconnecting client replays what it missed.
+    """
+
+    def __init__(self, request_id: str, maxlen: int = 1000):
+        self.request_id = request_id
+        self.events = deque(maxlen=maxlen)
+        self.next_seq = 1
+        self.closed = False
+        self.closed_at = None
+        self._cond = asyncio.Condition()
+
+    async def publish(self, data: str) -> int:
+        async with self._cond:
+            seq = self.next_seq
+            self.next_seq += 1
+            self.events.append((seq, data))
+            self._cond.notify_all()
+        return seq
+
+    async def close(self):
+        async with self._cond:
+            self.closed = True
+            self.closed_at = time.monotonic()
+            self._cond.notify_all()
+
+    def drained(self, after: int) -> bool:
+        """True once the channel is closed and a subscriber at `after` has seen every event."""
+        return self.closed and after >= self.next_seq - 1
+
+    async def subscribe(self, after: int = 0, heartbeat: float = 15.0) -> AsyncIterator[Optional[Tuple[int, str]]]:
+        """
+        Yield (seq, data) for every event after `after`, then live events as they arrive.
+        Yields None every `heartbeat` seconds of silence and returns once the channel
+        is closed and fully drained.
+        """
+        cursor = after
+        while True:
+            async with self._cond:
+                pending = [event for event in self.events if event[0] > cursor]
+                if not pending and not self.closed:
+                    try:
+                        await asyncio.wait_for(self._cond.wait(), heartbeat)
+                    except asyncio.TimeoutError:
+                        pass
+                    pending = [event for event in self.events if event[0] > cursor]
+                closed = self.closed
+            if pending:
+                for event in pending:
+                    cursor = event[0]
+                    yield event
+            elif closed:
+                return
+            else:
+                yield None
+
+
+class EventBus:
+    """Per-request channels for pipeline events, kept for `retention` seconds after the pipeline ends."""
+
+    def __init__(self, buffer_size: int = 1000, retention: float = 3600.0):
+        self.buffer_size = buffer_size
+        self.retention = retention
+        self._channels: Dict[str, RequestChannel] = {}
+
+    def create(self, request_id: str) -> RequestChannel:
+        self._purge()
+        channel = RequestChannel(request_id, self.buffer_size)
+        self._channels[request_id] = channel
+        return channel
+
+    def get(self, request_id: str) -> Optional[RequestChannel]:
+        return self._channels.get(request_id)
+
+    def _purge(self):
+        now = time.monotonic()
+        expired = [
+            request_id for request_id, channel in self._channels.items()
+            if channel.closed and now - channel.closed_at > self.retention
+        ]
+        for request_id in expired:
+            del self._channels[request_id]
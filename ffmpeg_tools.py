@@ -0,0 +1,81 @@
+import os
+import subprocess
+from typing import List
+
+import numpy as np
+
+
+def ffmpeg_binary() -> str:
+    """Return the ffmpeg executable moviepy is configured to use."""
+    from moviepy.config import get_setting
+    return get_setting("FFMPEG_BINARY")
+
+
+def run_ffmpeg(args: List[str], input_bytes: bytes = None) -> bytes:
+    """Run ffmpeg with the given arguments and return its stdout, raising on failure."""
+    cmd = [ffmpeg_binary(), "-hide_banner", "-loglevel", "error"] + args
+    proc = subprocess.run(cmd, input=input_bytes, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed ({' '.join(args)}): {proc.stderr.decode(errors='replace').strip()}")
+    return proc.stdout
+
+
+def decode_audio(path: str, fps: int = 44100, channels: int = 2) -> np.ndarray:
+    """
+    Decode an audio file to a float32 array of shape (samples, channels) in [-1, 1].
+    A single ffmpeg process is used and exits before this function returns.
+    """
+    raw = run_ffmpeg([
+        "-i", path,
+        "-vn",
+        "-f", "s16le",
+        "-acodec", "pcm_s16le",
+        "-ar", str(fps),
+        "-ac", str(channels),
+        "-"
+    ])
+    samples = np.frombuffer(raw, dtype=np.int16).reshape(-1, channels)
+    return samples.astype(np.float32) / 32768.0
+
+
+def encode_audio(samples: np.ndarray, output_path: str, fps: int = 44100,
+                 bitrate: str = "192k", normalize: bool = False):
+    """Encode a float32 (samples, channels) array to an AAC file, optionally loudness-normalized."""
+    channels = samples.shape[1]
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767.0).astype(np.int16)
+    args = [
+        "-y",
+        "-f", "s16le",
+        "-ar", str(fps),
+        "-ac", str(channels),
+        "-i", "-",
+    ]
+    if normalize:
+        # Single-pass EBU R128 normalization; loudnorm resamples internally so pin the rate again
+        args += ["-af", "loudnorm=I=-16:TP=-1.5:LRA=11", "-ar", str(fps)]
+    args += ["-c:a", "aac", "-b:a", bitrate, output_path]
+    run_ffmpeg(args, input_bytes=pcm.tobytes())
+
+
+def concat_segments(segment_paths: List[str], audio_path: str, output_path: str):
+    """
+    Join already-encoded video segments with the concat demuxer and mux in an
+    audio track, stream-copying both so nothing is re-encoded.
+    """
+    list_path = output_path + ".segments.txt"
+    with open(list_path, "w", encoding="utf-8") as f:
+        for path in segment_paths:
+            escaped = os.path.abspath(path).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+    try:
+        run_ffmpeg([
+            "-y",
+            "-f", "concat", "-safe", "0", "-i", list_path,
+            "-i", audio_path,
+            "-map", "0:v", "-map", "1:a",
+            "-c", "copy",
+            "-movflags", "+faststart",
+            output_path
+        ])
+    finally:
+        os.remove(list_path)
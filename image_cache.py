@@ -0,0 +1,55 @@
+import hashlib
+import json
+import os
+import re
+from typing import Optional
+from cache_utils import atomic_write, evict_lru, link_or_copy
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Canonical form of an image prompt: case, whitespace and trailing punctuation don't change the image."""
+    return re.sub(r"\s+", " ", prompt).strip().rstrip(".!,; ").lower()
+
+
+class ImageCache:
+    """
+    Local store of generated images keyed by (model, width, height, normalized prompt, seed).
+    Hits are linked into the request directory without calling the image provider;
+    the least recently used images are evicted once the store exceeds `max_bytes`.
+    """
+
+    def __init__(self, directory: str = "data/cache/images", max_bytes: int = 2 * 1024 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def make_key(model: str, width: int, height: int, prompt: str, seed: Optional[int] = None) -> str:
+        material = json.dumps({
+            "model": model,
+            "width": width,
+            "height": height,
+            "prompt": normalize_prompt(prompt),
+            "seed": seed,
+        }, sort_keys=True)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.jpg")
+
+    def fetch(self, key: str, dest_path: str) -> Optional[str]:
+        """Place the cached image for `key` at `dest_path` and return it, or None on a miss."""
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        # Touch the entry so eviction treats it as recently used
+        os.utime(path, None)
+        link_or_copy(path, dest_path)
+        return dest_path
+
+    def put(self, key: str, data: bytes, dest_path: str) -> str:
+        """Store downloaded image bytes, place them at `dest_path` and trim the store to budget."""
+        path = self._path(key)
+        atomic_write(path, data)
+        link_or_copy(path, dest_path)
+        evict_lru(self.directory, ".jpg", self.max_bytes)
+        return dest_path
@@ -0,0 +1,167 @@
+import logging
+import re
+import subprocess
+from ffmpeg_tools import ffmpeg_binary
+
+logger = logging.getLogger(__name__)
+
+# Bitrates in kbps indexed by [version_group][layer][bitrate_index]; version_group 1 = MPEG-1, 2 = MPEG-2/2.5
+_BITRATES = {
+    1: {
+        1: [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+        2: [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+        3: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    },
+    2: {
+        1: [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+        2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+        3: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    },
+}
+
+# "Duration: 00:01:02.34" line of ffmpeg's input summary
+_DURATION = re.compile(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+
+# Sample rates indexed by MPEG version bits (0 = 2.5, 2 = 2, 3 = 1)
+_SAMPLE_RATES = {
+    0: [11025, 12000, 8000],
+    2: [22050, 24000, 16000],
+    3: [44100, 48000, 32000],
+}
+
+
+def _skip_id3v2(f) -> int:
+    """Return the byte offset of the first MPEG frame candidate after any ID3v2 tag."""
+    header = f.read(10)
+    if len(header) == 10 and header[:3] == b"ID3":
+        size = (header[6] << 21) | (header[7] << 14) | (header[8] << 7) | header[9]
+        footer = 10 if header[5] & 0x10 else 0
+        return 10 + size + footer
+    return 0
+
+
+def _parse_frame_header(b: bytes):
+    """Decode a 4-byte MPEG audio frame header, or return None if it is not one."""
+    if len(b) < 4 or b[0] != 0xFF or (b[1] & 0xE0) != 0xE0:
+        return None
+    version_bits = (b[1] >> 3) & 0x03
+    layer_bits = (b[1] >> 1) & 0x03
+    bitrate_idx = (b[2] >> 4) & 0x0F
+    rate_idx = (b[2] >> 2) & 0x03
+    if version_bits == 1 or layer_bits == 0 or bitrate_idx in (0, 15) or rate_idx == 3:
+        return None
+    layer = 4 - layer_bits
+    group = 1 if version_bits == 3 else 2
+    sample_rate = _SAMPLE_RATES[version_bits][rate_idx]
+    if layer == 1:
+        samples_per_frame = 384
+    elif layer == 2 or group == 1:
+        samples_per_frame = 1152
+    else:
+        samples_per_frame = 576
+    bitrate = _BITRATES[group][layer][bitrate_idx] * 1000
+    padding = (b[2] >> 1) & 0x01
+    if layer == 1:
+        length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        length = samples_per_frame // 8 * bitrate // sample_rate + padding
+    return {
+        "mpeg1": group == 1,
+        "mono": ((b[3] >> 6) & 0x03) == 3,
+        "bitrate": bitrate,
+        "sample_rate": sample_rate,
+        "samples_per_frame": samples_per_frame,
+        "length": length,
+    }
+
+
+def _count_frames(data: bytes, sample_rate: int) -> int:
+    """
+    Count the complete MPEG frames in `data` by hopping from header to header using
+    each frame's length; no audio is decoded. Stops at the first thing that is not
+    a frame of the same stream, such as an ID3v1 or APE tag at the end of the file.
+    """
+    count = 0
+    pos = 0
+    while pos + 4 <= len(data):
+        frame = _parse_frame_header(data[pos:pos + 4])
+        if not frame or frame["sample_rate"] != sample_rate or pos + frame["length"] > len(data):
+            break
+        count += 1
+        pos += frame["length"]
+    return count
+
+
+def mp3_header_duration(path: str):
+    """
+    Read an MP3's duration from its frame headers without decoding any audio: the
+    Xing/Info or VBRI frame count when present, otherwise an exact count of the frames
+    in the file (a bitrate estimate would be wrong for VBR files without such a header).
+    Returns None if the file is not a recognisable MP3.
+    """
+    with open(path, "rb") as f:
+        offset = _skip_id3v2(f)
+        f.seek(offset)
+        # The first frame usually follows the tag directly; allow a little junk before it
+        window = f.read(64 * 1024)
+        frame = None
+        pos = 0
+        while pos < len(window) - 4:
+            pos = window.find(b"\xff", pos)
+            if pos < 0:
+                break
+            frame = _parse_frame_header(window[pos:pos + 4])
+            if frame:
+                break
+            pos += 1
+        if not frame:
+            return None
+
+        # Look for a VBR header inside the first frame
+        side_info = (32 if not frame["mono"] else 17) if frame["mpeg1"] else (17 if not frame["mono"] else 9)
+        xing = window[pos + 4 + side_info:pos + 4 + side_info + 12]
+        vbri = window[pos + 36:pos + 36 + 18]
+        frames = None
+        has_tag_frame = False
+        if xing[:4] in (b"Xing", b"Info"):
+            has_tag_frame = True
+            flags = int.from_bytes(xing[4:8], "big")
+            if flags & 0x01:
+                frames = int.from_bytes(xing[8:12], "big")
+        elif vbri[:4] == b"VBRI":
+            has_tag_frame = True
+            frames = int.from_bytes(vbri[14:18], "big")
+
+        if not frames:
+            f.seek(offset + pos)
+            frames = _count_frames(f.read(), frame["sample_rate"])
+            # The tag frame carries no audio and decoders skip it
+            if has_tag_frame:
+                frames -= 1
+        if frames <= 0:
+            return None
+        return frames * frame["samples_per_frame"] / frame["sample_rate"]
+
+
+def ffmpeg_duration(path: str) -> float:
+    """Read the container duration of any media file from ffmpeg's input summary."""
+    proc = subprocess.run([ffmpeg_binary(), "-hide_banner", "-i", path],
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    # With no output file ffmpeg exits non-zero after printing the input summary
+    match = _DURATION.search(proc.stderr.decode(errors="replace"))
+    if not match:
+        raise RuntimeError(f"Could not read the duration of {path}: {proc.stderr.decode(errors='replace').strip()}")
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def probe_duration(path: str) -> float:
+    """Return the duration of an audio file in seconds: MP3s from their frame headers, anything else via ffmpeg."""
+    if path.lower().endswith(".mp3"):
+        try:
+            duration = mp3_header_duration(path)
+            if duration:
+                return duration
+        except OSError as e:
+            logger.warning(f"Failed to read MP3 headers of {path}: {e}")
+    return ffmpeg_duration(path)
@@ -0,0 +1,127 @@
+import os
+import subprocess
+import tempfile
+from typing import List
+import numpy as np
+from ffmpeg_tools import ffmpeg_binary
+
+
+class OutputSpec:
+    """One rendition written from the shared frame pass: size, container and encoder settings."""
+
+    def __init__(self, path: str, width: int, height: int, fmt: str = None, video_bitrate: str = None,
+                 crf: int = None, preset: str = None, fps: int = None, duration: float = None):
+        self.path = path
+        self.width = width
+        self.height = height
+        # "mp4", "gif" or "webp"; inferred from the file extension when not given
+        self.fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower()
+        self.video_bitrate = video_bitrate
+        self.crf = crf
+        self.preset = preset
+        # Frame rate and length overrides, mainly for short animated teasers
+        self.fps = fps
+        self.duration = duration
+
+
+def default_renditions(output_dir: str) -> List[OutputSpec]:
+    """Standard social renditions: 1080x1920 high bitrate, 720x1280, and a 3-second GIF teaser."""
+    return [
+        OutputSpec(os.path.join(output_dir, "final_video.mp4"), 1080, 1920, video_bitrate="8M"),
+        OutputSpec(os.path.join(output_dir, "final_720.mp4"), 720, 1280, crf=26),
+        OutputSpec(os.path.join(output_dir, "teaser.gif"), 360, 640, fps=10, duration=3),
+    ]
+
+
+def build_multi_output_command(size, fps: int, audio_path: str, outputs: List[OutputSpec],
+                               preset: str = "medium", threads: int = None) -> List[str]:
+    """
+    ffmpeg command that reads raw RGB frames on stdin once, splits them with filter_complex,
+    scales each branch and writes every rendition in the same invocation.
+    """
+    filters = [f"[0:v]split={len(outputs)}" + "".join(f"[s{i}]" for i in range(len(outputs)))]
+    for i, spec in enumerate(outputs):
+        chain = []
+        if spec.duration:
+            chain.append(f"trim=duration={spec.duration},setpts=PTS-STARTPTS")
+        if spec.fps:
+            chain.append(f"fps={spec.fps}")
+        chain.append(f"scale={spec.width}:{spec.height}:flags=lanczos,setsar=1")
+        if spec.fmt == "gif":
+            # Per-clip palette keeps GIF colours close to the source
+            filters.append(f"[s{i}]{','.join(chain)},split[g{i}a][g{i}b]")
+            filters.append(f"[g{i}a]palettegen[p{i}]")
+            filters.append(f"[g{i}b][p{i}]paletteuse[v{i}]")
+        else:
+            filters.append(f"[s{i}]{','.join(chain)}[v{i}]")
+
+    cmd = [
+        ffmpeg_binary(), "-hide_banner", "-loglevel", "error", "-y",
+        "-f", "rawvideo", "-vcodec", "rawvideo",
+        "-s", f"{size[0]}x{size[1]}", "-pix_fmt", "rgb24", "-r", str(fps),
+        "-i", "-",
+        "-i", audio_path,
+        "-filter_complex", ";".join(filters),
+    ]
+    for i, spec in enumerate(outputs):
+        cmd += ["-map", f"[v{i}]"]
+        if spec.fmt == "gif":
+            cmd += ["-loop", "0"]
+        elif spec.fmt == "webp":
+            cmd += ["-c:v", "libwebp", "-loop", "0", "-q:v", "60"]
+        else:
+            cmd += ["-map", "1:a", "-c:a", "copy",
+                    "-c:v", "libx264", "-preset", spec.preset or preset, "-pix_fmt", "yuv420p"]
+            if spec.video_bitrate:
+                cmd += ["-b:v", spec.video_bitrate]
+            if spec.crf is not None:
+                cmd += ["-crf", str(spec.crf)]
+            if threads:
+                cmd += ["-threads", str(threads)]
+            if spec.duration:
+                cmd += ["-t", str(spec.duration)]
+            cmd += ["-movflags", "+faststart"]
+        cmd.append(spec.path)
+    return cmd
+
+
+class MultiOutputWriter:
+    """Feeds frames to a single ffmpeg process that encodes every rendition at once."""
+
+    def __init__(self, size, fps: int, audio_path: str, outputs: List[OutputSpec],
+                 preset: str = "medium", threads: int = None):
+        if not outputs:
+            raise ValueError("No outputs to write")
+        self.size = size
+        # ffmpeg's stderr goes to a file so a chatty encoder can never block the pipe
+        self._log = tempfile.TemporaryFile()
+        self.proc = subprocess.Popen(
+            build_multi_output_command(size, fps, audio_path, outputs, preset, threads),
+            stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=self._log
+        )
+
+    def write_frame(self, frame: np.ndarray):
+        try:
+            self.proc.stdin.write(frame.tobytes())
+        except BrokenPipeError:
+            self._raise_failure()
+
+    def close(self):
+        try:
+            if self.proc.stdin and not self.proc.stdin.closed:
+                self.proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        try:
+            if self.proc.wait() != 0:
+                self._raise_failure()
+        finally:
+            self._log.close()
+
+    def _raise_failure(self):
+        self.proc.wait()
+        error = ""
+        if not self._log.closed:
+            self._log.seek(0)
+            error = self._log.read().decode(errors="replace").strip()
+        raise RuntimeError(f"ffmpeg multi-output encode failed: {error}")
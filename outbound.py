@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import os
+import threading
+import httpx
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:  # httpx only speaks HTTP/2 when the h2 package is installed
+    HTTP2_AVAILABLE = False
+
+# Status codes worth retrying: throttling and transient upstream failures
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class OutboundClients:
+    """
+    Process-wide outbound I/O: one pooled httpx.AsyncClient (keep-alive, HTTP/2 when
+    available) shared by plain HTTP calls and the async OpenAI client. Created and
+    closed by the FastAPI lifespan so connections and TLS sessions are reused across requests.
+    The OpenAI client is only built on first use, so workers don't import the SDK at startup.
+    """
+
+    def __init__(self, timeout: float = 60.0, connect_timeout: float = 10.0, retries: int = 3,
+                 max_connections: int = 50, max_keepalive: int = 20, openai_retries: int = None):
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.retries = retries
+        # Set to 0 when a caller-side scheduler should see (and retry) every 429 itself
+        self.openai_retries = retries if openai_retries is None else openai_retries
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self.http = None
+        self._openai = None
+        self._openai_lock = threading.Lock()
+
+    @property
+    def openai(self):
+        """AsyncOpenAI client on the shared pool, created (and the SDK imported) on first access."""
+        with self._openai_lock:
+            if self._openai is None:
+                if self.http is None:
+                    raise RuntimeError("Outbound clients are not started")
+                from openai import AsyncOpenAI
+                self._openai = AsyncOpenAI(
+                    api_key=os.getenv("OPENAI_API_KEY"),
+                    http_client=self.http,
+                    max_retries=self.openai_retries,
+                    timeout=self.timeout,
+                )
+            return self._openai
+
+    async def openai_client(self):
+        """Return the OpenAI client, building it in a worker thread so the SDK import never blocks the loop."""
+        if self._openai is None:
+            if self.http is None:
+                await self.start()
+            return await asyncio.to_thread(lambda: self.openai)
+        return self._openai
+
+    async def start(self):
+        """Open the shared connection pool; the OpenAI client is built on it when first used."""
+        if self.http is not None:
+            return
+        limits = httpx.Limits(max_connections=self.max_connections,
+                              max_keepalive_connections=self.max_keepalive,
+                              keepalive_expiry=60.0)
+        # Transport-level retries cover connection failures; status retries happen in get()
+        transport = httpx.AsyncHTTPTransport(retries=self.retries, http2=HTTP2_AVAILABLE, limits=limits)
+        self.http = httpx.AsyncClient(
+            transport=transport,
+            timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+            follow_redirects=True,
+        )
+        logger.info(f"Outbound clients started (HTTP/2: {HTTP2_AVAILABLE})")
+
+    async def close(self):
+        """Close the shared pool; the OpenAI client rides on it and needs no separate close."""
+        if self.http is not None:
+            await self.http.aclose()
+        self.http = None
+        self._openai = None
+
+    async def get(self, url: str, retries: int = None, **kwargs) -> httpx.Response:
+        """
+        GET through the shared pool, retrying throttled or failed responses with
+        exponential backoff (honouring Retry-After when the server sends one).
+        Pass retries=0 to surface the first failure to the caller.
+        """
+        if self.http is None:
+            await self.start()
+        retries = self.retries if retries is None else retries
+        for attempt in range(retries + 1):
+            try:
+                response = await self.http.get(url, **kwargs)
+            except httpx.TransportError:
+                if attempt == retries:
+                    raise
+                await asyncio.sleep(2 ** attempt * 0.5)
+                continue
+            if response.status_code not in RETRY_STATUS_CODES or attempt == retries:
+                response.raise_for_status()
+                return response
+            retry_after = response.headers.get("Retry-After")
+            delay = float(retry_after) if retry_after and retry_after.isdigit() else 2 ** attempt * 0.5
+            logger.warning(f"GET {url} returned {response.status_code}, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
@@ -3,12 +3,13 @@ from typing import Dict, List, Optional
 
 class Scene:
     def __init__(self, scene_id: str, script: str, image_prompt: str,
-                 audio_path: str, image_url: str):
+                 audio_path: str, image_url: str, image_path: str = ""):
         self.scene_id = scene_id
         self.script = script
         self.image_prompt = image_prompt
         self.audio_path = audio_path
         self.image_url = image_url
+        self.image_path = image_path
 
     @classmethod
     def from_dict(cls, data: Dict) -> "Scene":
@@ -17,7 +18,8 @@ class Scene:
             script=data.get("script", ""),
             image_prompt=data.get("imagePrompt", ""),
             audio_path=data.get("audioPath", ""),
-            image_url=data.get("imageUrl", "")
+            image_url=data.get("imageUrl", ""),
+            image_path=data.get("imagePath", "")
         )
 
     def to_dict(self) -> Dict:
@@ -26,7 +28,8 @@ class Scene:
             "script": self.script,
             "imagePrompt": self.image_prompt,
             "audioPath": self.audio_path,
-            "imageUrl": self.image_url
+            "imageUrl": self.image_url,
+            "imagePath": self.image_path
         }
 
 class Payload:
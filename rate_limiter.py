@@ -0,0 +1,271 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import re
+import time
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Priority lanes: lower values are served first
+INTERACTIVE = 0
+BATCH = 1
+LANE_NAMES = {INTERACTIVE: "interactive", BATCH: "batch"}
+
+# "429" as a standalone status code, not digits inside a UUID, URL path or version string
+_STATUS_429 = re.compile(r"(?<![\w./-])429(?![\w/-])")
+
+
+def is_rate_limited(exc: Exception) -> bool:
+    """True if an exception from any provider SDK represents an HTTP 429."""
+    if getattr(exc, "status_code", None) == 429:
+        return True
+    response = getattr(exc, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    # Some SDKs (e.g. Runware over websockets) only carry the code in the message
+    message = str(exc).lower()
+    return bool(_STATUS_429.search(message)) or "too many requests" in message or "rate limit" in message
+
+
+def is_transient(exc: Exception) -> bool:
+    """True for upstream 5xx responses and connection-level failures worth retrying."""
+    status = getattr(exc, "status_code", None) or getattr(getattr(exc, "response", None), "status_code", None)
+    if isinstance(status, int) and status >= 500:
+        return True
+    name = type(exc).__name__
+    return "Connect" in name or "Timeout" in name
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, holding at most `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def time_until_available(self, tokens: float = 1.0) -> float:
+        """Seconds until `tokens` can be consumed (0 if available now)."""
+        self._refill()
+        if self.tokens >= tokens:
+            return 0.0
+        return (tokens - self.tokens) / self.rate
+
+    def consume(self, tokens: float = 1.0):
+        self._refill()
+        self.tokens -= tokens
+
+
+class AIMDConcurrency:
+    """
+    Additive-increase / multiplicative-decrease concurrency limit. Grows by roughly
+    one permit per window of healthy calls, shrinks gently when latency inflates
+    well above its running baseline and sharply on throttling.
+    """
+
+    def __init__(self, initial: int, minimum: int = 1, maximum: int = 32,
+                 backoff: float = 0.5, latency_tolerance: float = 2.0):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.baseline = None
+
+    @property
+    def permits(self) -> int:
+        return max(self.minimum, int(self.limit))
+
+    def on_success(self, latency: float):
+        if self.baseline is None:
+            self.baseline = latency
+        if latency > self.baseline * self.latency_tolerance:
+            self.limit = max(self.minimum, self.limit * 0.9)
+        else:
+            self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+        # Let the baseline drift slowly so a genuinely slower workload stops counting as congestion
+        self.baseline = 0.95 * self.baseline + 0.05 * latency
+
+    def on_throttle(self):
+        self.limit = max(self.minimum, self.limit * self.backoff)
+
+
+class QueueWaitStats:
+    """Queue-wait statistics for one priority lane."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def record(self, wait: float):
+        self.count += 1
+        self.total += wait
+        self.max = max(self.max, wait)
+        self.last = wait
+
+    def as_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "avg": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+            "last": self.last,
+        }
+
+
+class ProviderLimiter:
+    """Admission control for one (provider, model): token bucket, AIMD concurrency and priority queue."""
+
+    def __init__(self, provider_bucket: TokenBucket, model_bucket: TokenBucket, concurrency: AIMDConcurrency):
+        self.provider_bucket = provider_bucket
+        self.model_bucket = model_bucket
+        self.concurrency = concurrency
+        self.in_flight = 0
+        self._waiters = []
+        self._seq = itertools.count()
+        self._timer = None
+        # Queue-wait statistics per priority lane, and outcome statistics
+        self.waits: Dict[int, QueueWaitStats] = {}
+        self.throttled = 0
+
+    def _pump(self):
+        """Grant slots to the highest-priority waiters while permits and tokens allow."""
+        self._timer = None
+        while self._waiters and self.in_flight < self.concurrency.permits:
+            _, _, future = self._waiters[0]
+            if future.done():  # Cancelled while queued
+                heapq.heappop(self._waiters)
+                continue
+            delay = max(self.provider_bucket.time_until_available(), self.model_bucket.time_until_available())
+            if delay > 0:
+                self._timer = asyncio.get_running_loop().call_later(delay, self._pump)
+                return
+            heapq.heappop(self._waiters)
+            self.provider_bucket.consume()
+            self.model_bucket.consume()
+            self.in_flight += 1
+            future.set_result(None)
+
+    async def acquire(self, priority: int):
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        queued_at = time.monotonic()
+        if self._timer is None:
+            self._pump()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Slot was granted just as we were cancelled; hand it back
+                self.release()
+            raise
+        self.waits.setdefault(priority, QueueWaitStats()).record(time.monotonic() - queued_at)
+
+    def release(self, latency: Optional[float] = None, throttled: bool = False):
+        self.in_flight -= 1
+        if throttled:
+            self.throttled += 1
+            self.concurrency.on_throttle()
+        elif latency is not None:
+            self.concurrency.on_success(latency)
+        if self._timer is None:
+            self._pump()
+
+    def metrics(self) -> Dict:
+        return {
+            "queued": sum(1 for _, _, future in self._waiters if not future.done()),
+            "in_flight": self.in_flight,
+            "concurrency_limit": round(self.concurrency.limit, 2),
+            "throttled": self.throttled,
+            "queue_wait_seconds": {
+                LANE_NAMES.get(priority, str(priority)): stats.as_dict()
+                for priority, stats in sorted(self.waits.items())
+            },
+        }
+
+
+class ProviderScheduler:
+    """
+    Process-wide scheduler shared by every pipeline. Each provider has a token bucket,
+    each (provider, model) pair its own bucket and adaptive concurrency limit, and
+    waiting calls are served by priority lane (interactive before batch).
+
+    `limits` maps a provider name, or a (provider, model) tuple, to a dict with
+    `rate` (requests/second), `burst`, `concurrency` and `max_concurrency`.
+    Concurrency is only enforced per (provider, model); on a provider entry it is
+    the default for models without their own.
+    """
+
+    DEFAULT_LIMITS = {"rate": 5.0, "burst": 10, "concurrency": 4, "max_concurrency": 16}
+
+    def __init__(self, limits: Dict = None, max_retries: int = 3):
+        self.limits = limits or {}
+        self.max_retries = max_retries
+        self._provider_buckets: Dict[str, TokenBucket] = {}
+        self._limiters: Dict[Tuple[str, str], ProviderLimiter] = {}
+
+    def _config(self, key) -> Dict:
+        config = dict(self.DEFAULT_LIMITS)
+        provider = key[0] if isinstance(key, tuple) else key
+        config.update(self.limits.get(provider, {}))
+        if isinstance(key, tuple):
+            config.update(self.limits.get(key, {}))
+        return config
+
+    def limiter(self, provider: str, model: str = "default") -> ProviderLimiter:
+        key = (provider, model)
+        if key not in self._limiters:
+            if provider not in self._provider_buckets:
+                config = self._config(provider)
+                self._provider_buckets[provider] = TokenBucket(config["rate"], config["burst"])
+            config = self._config(key)
+            self._limiters[key] = ProviderLimiter(
+                self._provider_buckets[provider],
+                TokenBucket(config["rate"], config["burst"]),
+                AIMDConcurrency(config["concurrency"], maximum=config["max_concurrency"]),
+            )
+        return self._limiters[key]
+
+    @asynccontextmanager
+    async def slot(self, provider: str, model: str = "default", priority: int = INTERACTIVE):
+        """Hold one admitted call slot; latency and 429s observed inside feed the AIMD limit."""
+        limiter = self.limiter(provider, model)
+        await limiter.acquire(priority)
+        started = time.monotonic()
+        succeeded = False
+        throttled = False
+        try:
+            yield
+            succeeded = True
+        except Exception as e:
+            throttled = is_rate_limited(e)
+            raise
+        finally:
+            # Failures and cancellations free the slot without counting as a latency sample
+            limiter.release(latency=time.monotonic() - started if succeeded else None, throttled=throttled)
+
+    async def call(self, provider: str, model: str, fn: Callable[[], Awaitable], priority: int = INTERACTIVE):
+        """Run `fn()` under the scheduler, retrying 429s and transient failures with backoff."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self.slot(provider, model, priority):
+                    return await fn()
+            except Exception as e:
+                if attempt == self.max_retries or not (is_rate_limited(e) or is_transient(e)):
+                    raise
+                delay = 2 ** attempt
+                logger.warning(f"{provider}/{model} call failed ({e}); retry {attempt + 1} in {delay}s")
+                await asyncio.sleep(delay)
+
+    def metrics(self) -> Dict:
+        return {f"{provider}/{model}": limiter.metrics() for (provider, model), limiter in self._limiters.items()}
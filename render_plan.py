@@ -0,0 +1,71 @@
+from typing import Dict, List
+from media_probe import probe_duration
+
+
+class PlannedScene:
+    def __init__(self, index: int, scene_data: Dict, start: float, duration: float,
+                 audio_duration: float, frames: int):
+        self.index = index
+        self.scene_data = scene_data
+        # Time of the scene's first frame; its narration starts there in the mixed track
+        self.start = start
+        # How long the scene stays on screen (until the next scene starts)
+        self.duration = duration
+        # Length of the scene's own narration, including any crossfade tail
+        self.audio_duration = audio_duration
+        self.frames = frames
+
+
+class RenderPlan:
+    """Timeline for a whole video, computed from probed audio durations before anything is decoded."""
+
+    def __init__(self, scenes: List[PlannedScene], fps: int, crossfade: float, total_duration: float):
+        self.scenes = scenes
+        self.fps = fps
+        self.crossfade = crossfade
+        self.total_duration = total_duration
+
+    @property
+    def total_frames(self) -> int:
+        return sum(scene.frames for scene in self.scenes)
+
+    @property
+    def audio_offsets(self):
+        return [(scene.start, scene.audio_duration) for scene in self.scenes]
+
+    def longest_first(self) -> List[PlannedScene]:
+        """Scenes ordered for dispatch so the longest renders start first and workers finish together."""
+        return sorted(self.scenes, key=lambda scene: scene.frames, reverse=True)
+
+
+def build_render_plan(scenes: List[Dict], fps: int, crossfade: float = 0.0) -> RenderPlan:
+    """
+    Probe each scene's audio and lay out the timeline: scene offsets, on-screen
+    durations and frame counts. Each scene's frame count comes from its own
+    narration alone, so editing one scene leaves every other scene's frames (and
+    scene cache key) untouched. Scenes start on the cumulative frame boundary and
+    their narration is placed there, so rounding never drifts audio from video.
+    """
+    if not scenes:
+        raise ValueError("No scenes to plan")
+
+    durations = [probe_duration(scene["audioPath"]) for scene in scenes]
+    # Never let a fade eat more than half of the shortest scene
+    fade = min(crossfade, min(durations) / 2)
+
+    planned = []
+    boundary = 0
+    for i, (scene, duration) in enumerate(zip(scenes, durations)):
+        # A scene stays on screen until the next one's narration fades in
+        on_screen = duration if i == len(scenes) - 1 else duration - fade
+        frames = max(1, round(on_screen * fps))
+        planned.append(PlannedScene(
+            index=i + 1,
+            scene_data=scene,
+            start=boundary / fps,
+            duration=frames / fps,
+            audio_duration=duration,
+            frames=frames,
+        ))
+        boundary += frames
+    return RenderPlan(planned, fps, fade, boundary / fps)
@@ -0,0 +1,57 @@
+import hashlib
+import json
+import os
+import tempfile
+from typing import Dict, Optional
+from cache_utils import evict_lru, file_digest, link_or_copy
+
+
+class SceneCache:
+    """
+    Rendered scene segments keyed by the content that produced them: image bytes,
+    audio bytes, script text, planned frame count and render settings. Re-rendering
+    a payload only re-encodes scenes whose key changed; the rest are reused as-is.
+    """
+
+    def __init__(self, directory: str = "data/cache/scenes", max_bytes: int = 5 * 1024 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def make_key(scene_data: Dict, frames: int, settings: Dict) -> str:
+        material = json.dumps({
+            "image": file_digest(scene_data["imagePath"]),
+            "audio": file_digest(scene_data["audioPath"]),
+            "script": scene_data["script"],
+            "frames": frames,
+            "settings": settings,
+        }, sort_keys=True)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.mp4")
+
+    def fetch(self, key: str, dest_path: str) -> Optional[str]:
+        """Place the cached segment for `key` at `dest_path` and return it, or None on a miss."""
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        # Touch the entry so eviction treats it as recently used
+        os.utime(path, None)
+        link_or_copy(path, dest_path)
+        return dest_path
+
+    def put(self, key: str, segment_path: str):
+        """Store a freshly rendered segment and trim the cache back under its size budget."""
+        os.makedirs(self.directory, exist_ok=True)
+        # Unique temp name, so concurrent renders storing the same key never race on it
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(fd)
+        try:
+            link_or_copy(segment_path, tmp_path)
+            os.replace(tmp_path, self._path(key))
+        finally:
+            # rename() leaves the source in place when both names already link to the same file
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        evict_lru(self.directory, ".mp4", self.max_bytes)
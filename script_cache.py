@@ -0,0 +1,56 @@
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Optional
+from cache_utils import atomic_write, evict_lru, remove_quietly
+
+
+class ScriptCache:
+    """
+    Persistent cache of validated LLM scripts, one JSON file per entry.
+    Entries expire after `ttl` seconds and the least recently used ones are
+    evicted once the directory grows past `max_bytes`.
+    """
+
+    def __init__(self, directory: str = "data/cache/scripts", ttl: float = 7 * 24 * 3600,
+                 max_bytes: int = 50 * 1024 * 1024):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def make_key(model: str, template_version: str, article: Dict) -> str:
+        """Hash of everything that shapes the script: model, prompt template version and article text."""
+        material = json.dumps({
+            "model": model,
+            "template": template_version,
+            "title": article.get("title", ""),
+            "description": article.get("description", ""),
+            "content": article.get("content", ""),
+        }, sort_keys=True)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached script for `key`, or None if missing or expired."""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get("created", 0) > self.ttl:
+            remove_quietly(path)
+            return None
+        # Touch the file so eviction treats it as recently used
+        os.utime(path, None)
+        return entry["script"]
+
+    def put(self, key: str, script: Dict):
+        """Store a validated script, then trim the cache back under its size budget."""
+        entry = json.dumps({"created": time.time(), "script": script})
+        atomic_write(self._path(key), entry.encode("utf-8"))
+        evict_lru(self.directory, ".json", self.max_bytes, self.ttl)
@@ -1,21 +1,94 @@
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
-from moviepy.video.VideoClip import VideoClip
-from moviepy.editor import AudioFileClip, ImageClip, CompositeVideoClip, concatenate_videoclips
-from typing import Any
+# Import moviepy piecemeal: moviepy.editor pulls in every effect and preview backend at import time
+from moviepy.video.VideoClip import VideoClip, ImageClip
+from moviepy.audio.io.AudioFileClip import AudioFileClip
+from moviepy.video.compositing.CompositeVideoClip import CompositeVideoClip
+from moviepy.video.compositing.concatenate import concatenate_videoclips
+from moviepy.video.fx.resize import resize
+from moviepy.video.fx.crop import crop
+from moviepy.video.io.ffmpeg_writer import FFMPEG_VideoWriter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterator
+import logging
 import os
+import shutil
 import tempfile
 import urllib.request
+from audio_mixer import AudioMixer
+from ffmpeg_tools import concat_segments
+from multi_output import MultiOutputWriter
+from render_plan import build_render_plan
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Version of the scene compositing and subtitle rendering; bump it whenever generate_scene_clip,
+# generate_dynamic_subtitle or anything else that changes a frame's pixels changes, so cached scenes are not reused
+RENDER_VERSION = "1"
+
+# One generator per worker process, so fonts are loaded once per process rather than per scene
+_worker_generators = {}
+
+def _render_scene_segment(settings: dict, scene_data: dict, frames: int, segment_path: str) -> str:
+    key = tuple(sorted(settings.items()))
+    if key not in _worker_generators:
+        _worker_generators[key] = VideoGenerator(**settings)
+    _worker_generators[key].render_segment(scene_data, frames, segment_path)
+    return segment_path
+
+def peak_rss_mb() -> dict:
+    """Peak resident memory of this process and of its finished children (ffmpeg), in MB."""
+    if resource is None:
+        return {}
+    # ru_maxrss is reported in kilobytes on Linux
+    return {
+        "self": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+    }
 
 class VideoGenerator:
-    def __init__(self, width: int, height: int):
+    def __init__(self, width: int, height: int, fps: int = 24, audio_crossfade: float = 0.0,
+                 normalize_audio: bool = False, render_workers: int = 1, streaming: bool = True,
+                 scene_cache=None, preset: str = "medium", crf: int = None, threads: int = None):
         self.VIDEO_WIDTH = width
         self.VIDEO_HEIGHT = height
         self.VIDEO_SIZE = (width, height)
+        self.fps = fps
+        self.codec = "libx264"
+        # x264 speed/size trade-off; crf None keeps x264's default quality (23)
+        self.preset = preset
+        self.crf = crf
+        self.threads = threads
+        # Scenes are rendered as separate segments in this many processes when greater than 1
+        self.render_workers = render_workers
+        # Stream frames scene by scene into one encoder instead of composing every clip up front
+        self.streaming = streaming
+        # Optional SceneCache; when set, scenes are rendered as segments and unchanged ones reused
+        self.scene_cache = scene_cache
+        # Narration is mixed into a single track before any frame is rendered
+        self.audio_mixer = AudioMixer(crossfade=audio_crossfade, normalize=normalize_audio)
         # Dynamic font size: 4% of video height for a sophisticated look
         self.font_size = int(self.VIDEO_HEIGHT * 0.04)
         self.font = self._load_font()
 
+    @classmethod
+    def for_preview(cls, width: int, height: int, scale: float = 0.5, fps: int = 12, **kwargs) -> "VideoGenerator":
+        """
+        Generator for fast draft renders: the same timeline at reduced resolution and frame
+        rate with a fast x264 preset. The subtitle font scales with the height automatically.
+        """
+        # libx264 with yuv420p needs even dimensions
+        preview_width = max(2, int(width * scale) // 2 * 2)
+        preview_height = max(2, int(height * scale) // 2 * 2)
+        kwargs.setdefault("preset", "ultrafast")
+        kwargs.setdefault("crf", 30)
+        return cls(preview_width, preview_height, fps=fps, **kwargs)
+
     def _load_font(self):
         """Load a font, downloading Montserrat if necessary, with fallback to default."""
         temp_dir = tempfile.gettempdir()
@@ -126,15 +199,18 @@ class VideoGenerator:
 
         return VideoClip(make_frame, duration=duration)
 
-    def generate_scene_clip(self, scene_data: dict) -> VideoClip:
-        audio = AudioFileClip(scene_data["audioPath"])
-        duration = audio.duration
+    def generate_scene_clip(self, scene_data: dict, duration: float = None) -> VideoClip:
+        # With a known duration the scene is rendered silent against the pre-mixed track
+        audio = None
+        if duration is None:
+            audio = AudioFileClip(scene_data["audioPath"])
+            duration = audio.duration
         img = ImageClip(scene_data["imagePath"]).set_duration(duration)
-        img = img.resize(height=self.VIDEO_HEIGHT)
+        img = img.fx(resize, height=self.VIDEO_HEIGHT)
         if img.w > self.VIDEO_WIDTH:
-            img = img.crop(x_center=img.w/2, width=self.VIDEO_WIDTH)
+            img = img.fx(crop, x_center=img.w/2, width=self.VIDEO_WIDTH)
         else:
-            img = img.resize(width=self.VIDEO_WIDTH)
+            img = img.fx(resize, width=self.VIDEO_WIDTH)
 
         # Position subtitle in the third quarter (center of 50%-75% of screen height)
         subtitle_y = int(self.VIDEO_HEIGHT * 0.625)
@@ -142,15 +218,178 @@ class VideoGenerator:
                           .set_position(("center", subtitle_y))
 
         clip = CompositeVideoClip([img, subtitle], size=self.VIDEO_SIZE)\
-               .set_duration(duration).set_audio(audio)
+               .set_duration(duration)
+        if audio is not None:
+            clip = clip.set_audio(audio)
         return clip
 
-    def create_final_video(self, data: dict, output_file: str):
-        clips = []
+    def render_settings(self) -> dict:
+        """Everything besides scene content that changes a rendered segment; part of the scene cache key."""
+        return {
+            "render_version": RENDER_VERSION,
+            "width": self.VIDEO_WIDTH,
+            "height": self.VIDEO_HEIGHT,
+            "fps": self.fps,
+            "codec": self.codec,
+            "preset": self.preset,
+            "crf": self.crf,
+            "font": os.path.basename(getattr(self.font, "path", "default")),
+            "font_size": self.font_size,
+        }
+
+    def encoder_settings(self) -> dict:
+        """Constructor arguments that reproduce this generator's output in a worker process."""
+        return {
+            "width": self.VIDEO_WIDTH,
+            "height": self.VIDEO_HEIGHT,
+            "fps": self.fps,
+            "preset": self.preset,
+            "crf": self.crf,
+            "threads": self.threads,
+        }
+
+    def _ffmpeg_params(self) -> list:
+        return ["-crf", str(self.crf)] if self.crf is not None else []
+
+    def render_segment(self, scene_data: dict, frames: int, segment_path: str):
+        """Encode a single silent scene of exactly `frames` frames to its own file."""
+        clip = self.generate_scene_clip(scene_data, frames / self.fps)
+        try:
+            clip.write_videofile(segment_path, codec=self.codec, fps=self.fps, audio=False, logger=None,
+                                 preset=self.preset, threads=self.threads, ffmpeg_params=self._ffmpeg_params())
+        finally:
+            clip.close()
+
+    def iter_plan_frames(self, plan) -> Iterator[np.ndarray]:
+        """
+        Yield every frame of the plan in order, building one scene at a time and
+        closing it before the next is opened so memory stays flat with scene count.
+        """
+        for scene in plan.scenes:
+            clip = self.generate_scene_clip(scene.scene_data, scene.duration)
+            try:
+                for i in range(scene.frames):
+                    frame = clip.get_frame(i / self.fps)
+                    if frame.dtype != np.uint8:
+                        frame = frame.astype(np.uint8)
+                    yield frame
+            finally:
+                clip.close()
+                del clip
+
+    def _render_streaming(self, plan, audio_path: str, output_file: str):
+        """Pipe frames from one scene at a time into a single encoder, muxing the pre-mixed audio."""
+        writer = FFMPEG_VideoWriter(output_file, self.VIDEO_SIZE, self.fps, codec=self.codec,
+                                    audiofile=audio_path, preset=self.preset, threads=self.threads,
+                                    ffmpeg_params=self._ffmpeg_params() + ["-movflags", "+faststart"])
+        try:
+            for frame in self.iter_plan_frames(plan):
+                writer.write_frame(frame)
+        finally:
+            writer.close()
+
+    def _render_segments(self, plan, audio_path: str, output_file: str):
+        """
+        Render each scene to its own segment, reusing cached segments whose content key is
+        unchanged, spreading the rest across worker processes longest first, then
+        stream-copy all segments together.
+        """
+        segment_dir = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(output_file)))
+        try:
+            segment_paths = {scene.index: os.path.join(segment_dir, f"scene_{scene.index}.mp4")
+                             for scene in plan.scenes}
+            pending = []
+            for scene in plan.longest_first():
+                key = None
+                if self.scene_cache is not None:
+                    key = self.scene_cache.make_key(scene.scene_data, scene.frames, self.render_settings())
+                    if self.scene_cache.fetch(key, segment_paths[scene.index]):
+                        continue
+                pending.append((scene, key))
+            logger.info(f"Encoding {len(pending)} of {len(plan.scenes)} scenes; the rest come from the scene cache")
+
+            workers = min(self.render_workers, len(pending))
+            if workers > 1:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    futures = [
+                        pool.submit(_render_scene_segment, self.encoder_settings(), scene.scene_data,
+                                    scene.frames, segment_paths[scene.index])
+                        for scene, _ in pending
+                    ]
+                    for future in futures:
+                        future.result()
+            else:
+                for scene, _ in pending:
+                    self.render_segment(scene.scene_data, scene.frames, segment_paths[scene.index])
+
+            if self.scene_cache is not None:
+                for scene, key in pending:
+                    self.scene_cache.put(key, segment_paths[scene.index])
+
+            concat_segments([segment_paths[scene.index] for scene in plan.scenes], audio_path, output_file)
+        finally:
+            shutil.rmtree(segment_dir, ignore_errors=True)
+
+    def _ordered_scenes(self, data: dict) -> list:
         total = int(data.get("scenes", len([k for k in data if k.isdigit()])))
-        for i in range(1, total + 1):
-            key = str(i)
-            if key in data:
-                clips.append(self.generate_scene_clip(data[key]))
-        final = concatenate_videoclips(clips, method="compose")
-        final.write_videofile(output_file, codec="libx264", audio_codec="aac", fps=24, audio=True)
\ No newline at end of file
+        return [data[str(i)] for i in range(1, total + 1) if str(i) in data]
+
+    def _log_render_stats(self, plan, target: str) -> dict:
+        rss = peak_rss_mb()
+        if rss:
+            logger.info(f"Rendered {len(plan.scenes)} scenes ({plan.total_frames} frames) to {target}; "
+                        f"peak RSS {rss['self']:.0f} MB, ffmpeg children {rss['children']:.0f} MB")
+        return rss
+
+    def create_final_video(self, data: dict, output_file: str):
+        scenes = self._ordered_scenes(data)
+
+        # Plan the whole timeline from audio headers before decoding anything
+        plan = build_render_plan(scenes, self.fps, self.audio_mixer.crossfade)
+
+        # Decode and mix all narration once, placed at the planned offsets
+        fd, audio_file = tempfile.mkstemp(suffix=".m4a", dir=os.path.dirname(os.path.abspath(output_file)))
+        os.close(fd)
+        try:
+            track = self.audio_mixer.mix_plan(plan, audio_file)
+            if self.render_workers > 1 or self.scene_cache is not None:
+                self._render_segments(plan, track.path, output_file)
+            elif self.streaming:
+                self._render_streaming(plan, track.path, output_file)
+            else:
+                clips = [self.generate_scene_clip(scene.scene_data, scene.duration) for scene in plan.scenes]
+                final = concatenate_videoclips(clips, method="compose")
+                # Passing a file name makes moviepy stream-copy the AAC track into the container
+                final.write_videofile(output_file, codec=self.codec, fps=self.fps, audio=track.path,
+                                      preset=self.preset, threads=self.threads,
+                                      ffmpeg_params=self._ffmpeg_params() + ["-movflags", "+faststart"])
+                final.close()
+        finally:
+            os.remove(audio_file)
+
+        return self._log_render_stats(plan, output_file)
+
+    def create_multi_output(self, data: dict, outputs: list):
+        """
+        Compose every frame once at this generator's resolution and encode all renditions
+        (OutputSpec list) from that single pass in one ffmpeg process, so each extra
+        rendition costs only its encode.
+        """
+        scenes = self._ordered_scenes(data)
+        plan = build_render_plan(scenes, self.fps, self.audio_mixer.crossfade)
+
+        fd, audio_file = tempfile.mkstemp(suffix=".m4a", dir=os.path.dirname(os.path.abspath(outputs[0].path)))
+        os.close(fd)
+        try:
+            track = self.audio_mixer.mix_plan(plan, audio_file)
+            writer = MultiOutputWriter(self.VIDEO_SIZE, self.fps, track.path, outputs,
+                                       preset=self.preset, threads=self.threads)
+            try:
+                for frame in self.iter_plan_frames(plan):
+                    writer.write_frame(frame)
+            finally:
+                writer.close()
+        finally:
+            os.remove(audio_file)
+
+        return self._log_render_stats(plan, ", ".join(spec.path for spec in outputs))
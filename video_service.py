@@ -1,9 +1,11 @@
 import json
-from typing import Dict
+from typing import Dict, List
 from payload_parser import Payload
 from video_generator import VideoGenerator
+from multi_output import OutputSpec
 import requests
 import os
+import shutil
 import tempfile
 import logging
 
@@ -11,9 +13,25 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Shared session so fallback image downloads reuse keep-alive connections
+http_session = requests.Session()
+
+# Seconds to wait for an image download before giving up
+IMAGE_DOWNLOAD_TIMEOUT = 60
+
 class VideoService:
-    def __init__(self, width: int, height: int):
-        self.generator = VideoGenerator(width, height)
+    def __init__(self, width: int, height: int, render_workers: int = 1, streaming: bool = True,
+                 scene_cache=None, preview: bool = False, preset: str = "medium", crf: int = None,
+                 threads: int = None):
+        """
+        Set preview=True for a fast draft: half resolution, 12 fps and a fast x264 preset.
+        preset, crf and threads tune the encoder for full renders.
+        """
+        options = dict(render_workers=render_workers, streaming=streaming, scene_cache=scene_cache, threads=threads)
+        if preview:
+            self.generator = VideoGenerator.for_preview(width, height, **options)
+        else:
+            self.generator = VideoGenerator(width, height, preset=preset, crf=crf, **options)
 
     def generate_from_dict(self, data: Dict, output_file: str):
         """
@@ -24,7 +42,7 @@ class VideoService:
         if "scenes" not in data:
             count = len([k for k in data.keys() if k.isdigit()])
             data["scenes"] = str(count)
-        self.generator.create_final_video(data, output_file)
+        return self.generator.create_final_video(data, output_file)
 
     def generate_from_json(self, json_str: str, output_file: str):
         """
@@ -46,10 +64,10 @@ class VideoService:
             json_str = f.read()
         self.generate_from_json(json_str, output_file)
 
-    def generate(self, input_json_path: str, output_video_path: str):
+    def _load_scene_dict(self, input_json_path: str, tmp_dir: str) -> Dict:
         """
-        Load payload from a JSON file, download images and stitch scenes into a single video,
-        then generate an SRT subtitle file with word-sync for social media.
+        Load payload from a JSON file and build the scene dict for VideoGenerator,
+        downloading into tmp_dir any images not already on disk.
         """
         # Validate input JSON file
         if not os.path.exists(input_json_path):
@@ -68,9 +86,6 @@ class VideoService:
             logger.error("No scenes found in payload")
             raise ValueError("No scenes found in payload")
 
-        # Create temporary directory for downloaded images
-        tmp_dir = tempfile.mkdtemp()
-
         # Build scene dict for VideoGenerator
         scene_dict = {}
         for idx, scene in enumerate(scenes, start=1):
@@ -80,18 +95,22 @@ class VideoService:
                 logger.error(f"Audio file not found: {audio_path}")
                 raise FileNotFoundError(f"Audio file not found: {audio_path}")
 
-            # Download image from URL
-            try:
-                img_resp = requests.get(scene.image_url)
-                img_resp.raise_for_status()
-            except requests.RequestException as e:
-                logger.error(f"Failed to download image for scene {idx}: {scene.image_url}, error: {e}")
-                raise
+            if scene.image_path and os.path.exists(scene.image_path):
+                # Image was already downloaded by the pipeline
+                img_path = scene.image_path
+            else:
+                # Download image from URL
+                try:
+                    img_resp = http_session.get(scene.image_url, timeout=IMAGE_DOWNLOAD_TIMEOUT)
+                    img_resp.raise_for_status()
+                except requests.RequestException as e:
+                    logger.error(f"Failed to download image for scene {idx}: {scene.image_url}, error: {e}")
+                    raise
 
-            # Use unique file name based on index
-            img_path = os.path.join(tmp_dir, f"scene_{idx}.jpg")
-            with open(img_path, "wb") as img_file:
-                img_file.write(img_resp.content)
+                # Use unique file name based on index
+                img_path = os.path.join(tmp_dir, f"scene_{idx}.jpg")
+                with open(img_path, "wb") as img_file:
+                    img_file.write(img_resp.content)
 
             # Populate scene entry
             scene_dict[str(idx)] = {
@@ -103,12 +122,30 @@ class VideoService:
 
         # Add total scenes count
         scene_dict["scenes"] = str(len(scenes))
+        return scene_dict
 
-        # Generate video
+    def generate(self, input_json_path: str, output_video_path: str):
+        """
+        Load payload from a JSON file, download any images not already on disk and stitch scenes into a single video,
+        then generate an SRT subtitle file with word-sync for social media.
+        """
+        # Create temporary directory for downloaded images
+        tmp_dir = tempfile.mkdtemp()
         try:
-            self.generate_from_dict(scene_dict, output_video_path)
+            scene_dict = self._load_scene_dict(input_json_path, tmp_dir)
+            return self.generate_from_dict(scene_dict, output_video_path)
         finally:
             # Clean up temporary directory
-            for file in os.listdir(tmp_dir):
-                os.remove(os.path.join(tmp_dir, file))
-            os.rmdir(tmp_dir)
\ No newline at end of file
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def generate_renditions(self, input_json_path: str, outputs: List[OutputSpec]):
+        """
+        Load payload from a JSON file and encode several renditions (sizes/formats) from
+        a single frame pass. Frames are composed at this service's resolution.
+        """
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            scene_dict = self._load_scene_dict(input_json_path, tmp_dir)
+            return self.generator.create_multi_output(scene_dict, outputs)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)